@@ -27,8 +27,13 @@ class EventProcessingStore(Service):
     implementations.
     """
 
-    def __init__(self, inner: KVStorage[str, Event]):
+    def __init__(
+        self, inner: KVStorage[str, Event], raw_inner: KVStorage[str, str | bytes] | None = None
+    ):
         self.inner = inner
+        # Optional view of the same storage that takes already JSON-encoded
+        # events, without going through the codec of `inner`.
+        self.raw_inner = raw_inner
         self.timeout = timedelta(seconds=DEFAULT_TIMEOUT)
 
     def __get_unprocessed_key(self, key: str) -> str:
@@ -45,6 +50,21 @@ class EventProcessingStore(Service):
         self.inner.set(key, event, self.timeout)
         return key
 
+    def store_raw(self, event: Event, payload: str | bytes) -> str:
+        """
+        Store an event together with the JSON `payload` it was parsed from.
+
+        If the backend supports it, the payload is written as-is instead of
+        serializing the event again. `event` must not have been modified
+        after parsing it from `payload`.
+        """
+        if self.raw_inner is None:
+            return self.store(event)
+
+        key = cache_key_for_event(event)
+        self.raw_inner.set(key, payload, self.timeout)
+        return key
+
     def get(self, key: str, unprocessed: bool = False) -> MutableMapping[str, Any] | None:
         if unprocessed:
             key = self.__get_unprocessed_key(key)
@@ -10,7 +10,7 @@ from arroyo.processing.strategies import (
     FilterStep,
     ProcessingStrategy,
     ProcessingStrategyFactory,
-    RunTask,
+    RunTaskInThreads,
 )
 from arroyo.types import Commit, FilteredPayload, Message, Partition
 
@@ -19,6 +19,7 @@ from sentry.processing.backpressure.arroyo import HealthChecker, create_backpres
 from sentry.utils.arroyo import MultiprocessingPool, run_task_with_multiprocessing
 
 from .attachment_event import decode_and_process_chunks, process_attachments_and_events
+from .processors import flush_best_effort_writes
 from .simple_event import process_simple_event_message
 
 
@@ -33,6 +34,10 @@ class MultiProcessConfig(NamedTuple):
 TInput = TypeVar("TInput")
 TOutput = TypeVar("TOutput")
 
+# Number of messages that may be in flight in the single-process pipeline. With
+# a depth of 2 the next message is polled while the current one is processed.
+PIPELINE_DEPTH = 2
+
 
 def maybe_multiprocess_step(
     mp: MultiProcessConfig | None,
@@ -52,8 +57,15 @@ def maybe_multiprocess_step(
             output_block_size=mp.output_block_size,
         )
     else:
-        return RunTask(
-            function=function,
+        # A single worker thread keeps messages processed strictly in order, while
+        # the consumer keeps polling on the main thread. Offsets are only committed
+        # once the message has been fully processed.
+        return RunTaskInThreads(
+            processing_function=function,
+            concurrency=1,
+            # `RunTaskInThreads` only rejects messages once more than
+            # `max_pending_futures` are pending.
+            max_pending_futures=PIPELINE_DEPTH - 1,
             next_step=next_step,
         )
 
@@ -143,6 +155,8 @@ class IngestStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
         return create_backpressure_step(health_checker=self.health_checker, next_step=step_1)
 
     def shutdown(self) -> None:
+        # Don't lose the deduplication markers that are still being written
+        flush_best_effort_writes()
         self._pool.close()
         if self._attachments_pool:
             self._attachments_pool.close()
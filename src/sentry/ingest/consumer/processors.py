@@ -1,6 +1,9 @@
+import contextlib
 import functools
 import logging
-from collections.abc import Mapping, MutableMapping
+import threading
+from collections.abc import Callable, Mapping
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 import orjson
@@ -11,17 +14,16 @@ from usageaccountant import UsageUnit
 
 from sentry import eventstore, features
 from sentry.attachments import CachedAttachment, attachment_cache
-from sentry.event_manager import save_attachment
+from sentry.attachments.base import UNINITIALIZED_DATA
 from sentry.eventstore.processing import event_processing_store
 from sentry.feedback.usecases.create_feedback import FeedbackCreationSource
-from sentry.ingest.userreport import Conflict, save_userreport
-from sentry.killswitches import killswitch_matches_context
+from sentry.killswitches import killswitch_is_enabled, killswitch_matches_context
 from sentry.models.project import Project
 from sentry.signals import event_accepted
 from sentry.tasks.store import preprocess_event, save_event_feedback, save_event_transaction
 from sentry.usage_accountant import record
 from sentry.utils import metrics
-from sentry.utils.cache import cache_key_for_event
+from sentry.utils.cache import cache_key_for_event_id
 from sentry.utils.dates import to_datetime
 from sentry.utils.snuba import RateLimitExceeded
 
@@ -29,13 +31,79 @@ logger = logging.getLogger(__name__)
 
 CACHE_TIMEOUT = 3600
 
+# Best-effort writes (such as deduplication markers) are handed off to a small
+# thread pool so the consumer does not wait for them. Once too many of them
+# are pending, they are run inline again to apply backpressure.
+BEST_EFFORT_MAX_WORKERS = 4
+BEST_EFFORT_MAX_PENDING = 1000
+
+# Event types for which rc-processing usage is recorded, mapped to the
+# app feature they are accounted under.
+USAGE_APP_FEATURES = {"error": "errors", "transaction": "transactions"}
+
 IngestMessage = Mapping[str, Any]
 
+# The pool is created lazily, as consumers fork their worker processes after
+# importing this module and threads do not survive a fork.
+_best_effort_pool: ThreadPoolExecutor | None = None
+_best_effort_slots = threading.BoundedSemaphore(BEST_EFFORT_MAX_PENDING)
+
 
 class Retriable(Exception):
     pass
 
 
+def _submit_best_effort(function: Callable[..., None], *args: Any) -> None:
+    global _best_effort_pool
+
+    if not _best_effort_slots.acquire(blocking=False):
+        function(*args)
+        return
+
+    try:
+        if _best_effort_pool is None:
+            _best_effort_pool = ThreadPoolExecutor(
+                max_workers=BEST_EFFORT_MAX_WORKERS,
+                thread_name_prefix="ingest-consumer-best-effort",
+            )
+        future = _best_effort_pool.submit(function, *args)
+    except Exception:
+        _best_effort_slots.release()
+        raise
+
+    future.add_done_callback(lambda _: _best_effort_slots.release())
+
+
+def flush_best_effort_writes() -> None:
+    """
+    Wait for all pending best-effort writes and shut down their thread pool.
+    The pool is created again on the next write.
+    """
+    global _best_effort_pool
+
+    pool, _best_effort_pool = _best_effort_pool, None
+    if pool is not None:
+        pool.shutdown(wait=True)
+
+
+def _remember_processed_event(deduplication_key: str) -> None:
+    # remember for an 1 hour that we saved this event (deduplication protection)
+    try:
+        cache.set(deduplication_key, "", CACHE_TIMEOUT)
+    except Exception:
+        logger.warning("ingest_consumer.deduplication.set_failed", exc_info=True)
+
+
+def start_span(op: str) -> contextlib.AbstractContextManager[Any]:
+    """
+    Like `sentry_sdk.start_span`, but skips creating the span entirely if
+    ingest consumer transactions are never sampled.
+    """
+    if getattr(settings, "SENTRY_INGEST_CONSUMER_APM_SAMPLING", 0) > 0:
+        return sentry_sdk.start_span(op=op)
+    return contextlib.nullcontext()
+
+
 def trace_func(**span_kwargs):
     def wrapper(f):
         @functools.wraps(f)
@@ -71,7 +139,8 @@ def process_event(
     sentry_sdk.set_extra("event_id", event_id)
     sentry_sdk.set_extra("len_attachments", len(attachments))
 
-    if project_id == settings.SENTRY_PROJECT:
+    is_internal_project = project_id == settings.SENTRY_PROJECT
+    if is_internal_project:
         metrics.incr("internal.captured.ingest_consumer.unparsed")
 
     # check that we haven't already processed this event (a previous instance of the forwarder
@@ -103,7 +172,7 @@ def process_event(
         )
         return  # message already processed do not reprocess
 
-    if killswitch_matches_context(
+    if killswitch_is_enabled("store.load-shed-pipeline-projects") and killswitch_matches_context(
         "store.load-shed-pipeline-projects",
         {
             "project_id": project_id,
@@ -115,23 +184,44 @@ def process_event(
         # cause additional load on our logging infrastructure
         return
 
+    # If we only want to reprocess "stuck" events, we check if this event is already in the
+    # `processing_store`. We only continue here if the event *is* present, as that will eventually
+    # process and consume the event from the `processing_store`, whereby getting it "unstuck".
+    # The message carries everything needed for this check, so it is done before paying for
+    # parsing the payload.
+    if reprocess_only_stuck_events:
+        try:
+            is_stuck = event_processing_store.exists({"event_id": event_id, "project": project_id})
+        except Exception as exc:
+            raise Retriable(exc)
+
+        if not is_stuck:
+            return
+
     # Parse the JSON payload. This is required to compute the cache key and
     # call process_event. The payload will be put into Kafka raw, to avoid
     # serializing it again.
+    #
+    # NOTE: orjson caches the str objects of short object keys across calls,
+    # so recurring keys ("type", "event_id", "spans", ...) already share
+    # storage. Interning them again after parsing would only add a pass.
     data = orjson.loads(payload)
+    event_type = data.get("type")
 
-    if project_id == settings.SENTRY_PROJECT:
+    if is_internal_project:
         metrics.incr(
             "internal.captured.ingest_consumer.parsed",
-            tags={"event_type": data.get("type") or "null"},
+            tags={"event_type": event_type or "null"},
         )
 
-    if killswitch_matches_context(
+    if killswitch_is_enabled(
+        "store.load-shed-parsed-pipeline-projects"
+    ) and killswitch_matches_context(
         "store.load-shed-parsed-pipeline-projects",
         {
             "organization_id": project.organization_id,
             "project_id": project.id,
-            "event_type": data.get("type") or "null",
+            "event_type": event_type or "null",
             "has_attachments": bool(attachments),
             "event_id": event_id,
         },
@@ -141,35 +231,37 @@ def process_event(
     # Raise the retriable exception and skip DLQ if anything below this point fails as it may be caused by
     # intermittent network issue
     try:
-        # If we only want to reprocess "stuck" events, we check if this event is already in the
-        # `processing_store`. We only continue here if the event *is* present, as that will eventually
-        # process and consume the event from the `processing_store`, whereby getting it "unstuck".
-        if reprocess_only_stuck_events and not event_processing_store.exists(data):
-            return
-
         with metrics.timer("ingest_consumer._store_event"):
-            cache_key = event_processing_store.store(data)
-
-        try:
-            # Records rc-processing usage broken down by
-            # event type.
-            event_type = data.get("type")
-            if event_type == "error":
-                app_feature = "errors"
-            elif event_type == "transaction":
-                app_feature = "transactions"
-            else:
-                app_feature = None
-
-            if app_feature is not None:
+            # `data` is unmodified at this point, so the original payload can
+            # be stored instead of serializing `data` again.
+            cache_key = event_processing_store.store_raw(data, payload)
+
+        # Records rc-processing usage broken down by
+        # event type.
+        app_feature = USAGE_APP_FEATURES.get(event_type)
+        if app_feature is not None:
+            try:
                 record(settings.EVENT_PROCESSING_STORE, app_feature, len(payload), UsageUnit.BYTES)
-        except Exception:
-            pass
+            except Exception:
+                # Usage accounting must never hold up ingestion, but failures
+                # should at least be visible.
+                metrics.incr("ingest_consumer.record_usage.failed")
 
         if attachments:
-            with sentry_sdk.start_span(op="ingest_consumer.set_attachment_cache"):
+            with start_span(op="ingest_consumer.set_attachment_cache"):
+                # `attachment_cache.set` iterates the attachments twice, so this
+                # needs to stay a list.
                 attachment_objects = [
-                    CachedAttachment(type=attachment.pop("attachment_type"), **attachment)
+                    CachedAttachment(
+                        id=attachment.get("id"),
+                        name=attachment.get("name"),
+                        content_type=attachment.get("content_type"),
+                        type=attachment["attachment_type"],
+                        data=attachment.get("data", UNINITIALIZED_DATA),
+                        chunks=attachment.get("chunks"),
+                        rate_limited=attachment.get("rate_limited"),
+                        size=attachment.get("size"),
+                    )
                     for attachment in attachments
                 ]
 
@@ -177,7 +269,7 @@ def process_event(
                     cache_key, attachments=attachment_objects, timeout=CACHE_TIMEOUT
                 )
 
-        if data.get("type") == "transaction":
+        if event_type == "transaction":
             # No need for preprocess/process for transactions thus submit
             # directly transaction specific save_event task.
             save_event_transaction.delay(
@@ -189,11 +281,11 @@ def process_event(
             )
 
             try:
-                collect_span_metrics(project, data)
+                collect_span_metrics(project, len(data.get("spans") or ()))
             except Exception:
                 pass
 
-        elif data.get("type") == "feedback":
+        elif event_type == "feedback":
             if features.has("organizations:user-feedback-ingest", project.organization, actor=None):
                 save_event_feedback.delay(
                     cache_key=None,  # no need to cache as volume is low
@@ -206,7 +298,7 @@ def process_event(
             # Preprocess this event, which spawns either process_event or
             # save_event. Pass data explicitly to avoid fetching it again from the
             # cache.
-            with sentry_sdk.start_span(op="ingest_consumer.process_event.preprocess_event"):
+            with start_span(op="ingest_consumer.process_event.preprocess_event"):
                 preprocess_event(
                     cache_key=cache_key,
                     data=data,
@@ -216,11 +308,12 @@ def process_event(
                     has_attachments=bool(attachments),
                 )
 
-        # remember for an 1 hour that we saved this event (deduplication protection)
-        cache.set(deduplication_key, "", CACHE_TIMEOUT)
-
         # emit event_accepted once everything is done
         event_accepted.send_robust(ip=remote_addr, data=data, project=project, sender=process_event)
+
+        # The deduplication marker is best-effort anyway, there is no need to
+        # wait for it before moving on to the next message.
+        _submit_best_effort(_remember_processed_event, deduplication_key)
     except Exception as exc:
         if isinstance(exc, KeyError):  # ex: missing event_id in message["payload"]
             raise
@@ -235,7 +328,7 @@ def process_attachment_chunk(message: IngestMessage) -> None:
     project_id = message["project_id"]
     id = message["id"]
     chunk_index = message["chunk_index"]
-    cache_key = cache_key_for_event({"event_id": event_id, "project": project_id})
+    cache_key = cache_key_for_event_id(event_id, project_id)
     attachment_cache.set_chunk(
         key=cache_key, id=id, chunk_index=chunk_index, chunk_data=payload, timeout=CACHE_TIMEOUT
     )
@@ -244,14 +337,16 @@ def process_attachment_chunk(message: IngestMessage) -> None:
 @trace_func(name="ingest_consumer.process_individual_attachment")
 @metrics.wraps("ingest_consumer.process_individual_attachment")
 def process_individual_attachment(message: IngestMessage, project: Project) -> None:
+    from sentry.event_manager import save_attachment
+
     event_id = message["event_id"]
-    cache_key = cache_key_for_event({"event_id": event_id, "project": project.id})
+    cache_key = cache_key_for_event_id(event_id, project.id)
 
     if not features.has("organizations:event-attachments", project.organization, actor=None):
         logger.info("Organization has no event attachments: %s", project.id)
         return
 
-    if killswitch_matches_context(
+    if killswitch_is_enabled("store.load-shed-pipeline-projects") and killswitch_matches_context(
         "store.load-shed-pipeline-projects",
         {
             "project_id": project.id,
@@ -285,11 +380,19 @@ def process_individual_attachment(message: IngestMessage, project: Project) -> N
         group_id = event.group_id
 
     attachment_msg = message["attachment"]
-    attachment_type = attachment_msg.pop("attachment_type")
+    attachment_type = attachment_msg["attachment_type"]
 
     # NOTE: `get_from_chunks` will avoid the cache if `attachment_msg` contains `data` inline
     attachment = attachment_cache.get_from_chunks(
-        key=cache_key, type=attachment_type, **attachment_msg
+        key=cache_key,
+        id=attachment_msg.get("id"),
+        name=attachment_msg.get("name"),
+        content_type=attachment_msg.get("content_type"),
+        type=attachment_type,
+        data=attachment_msg.get("data", UNINITIALIZED_DATA),
+        chunks=attachment_msg.get("chunks"),
+        rate_limited=attachment_msg.get("rate_limited"),
+        size=attachment_msg.get("size"),
     )
 
     if attachment_type in ("event.attachment", "event.view_hierarchy"):
@@ -311,6 +414,8 @@ def process_individual_attachment(message: IngestMessage, project: Project) -> N
 @trace_func(name="ingest_consumer.process_userreport")
 @metrics.wraps("ingest_consumer.process_userreport")
 def process_userreport(message: IngestMessage, project: Project) -> bool:
+    from sentry.ingest.userreport import Conflict, save_userreport
+
     start_time = to_datetime(message["start_time"])
     feedback = orjson.loads(message["payload"])
 
@@ -334,14 +439,12 @@ def process_userreport(message: IngestMessage, project: Project) -> bool:
 
 def collect_span_metrics(
     project: Project,
-    data: MutableMapping[str, Any],
+    span_count: int,
 ):
     if not features.has(
         "organizations:dynamic-sampling", project.organization
     ) and not features.has("organizations:am3_tier", project.organization):
-        amount = (
-            len(data.get("spans", [])) + 1
-        )  # Segment spans also get added to the total span count.
+        amount = span_count + 1  # Segment spans also get added to the total span count.
         metrics.incr(
             "event.save_event.unsampled.spans.count",
             amount=amount,
@@ -7,6 +7,7 @@ __all__ = (
     "set_signing_secret",
     "SLACK_RATE_LIMITED_MESSAGE",
     "strip_channel_name",
+    "valid_team_membership_filter",
     "validate_channel_id",
 )
 
@@ -15,7 +16,7 @@ import logging
 
 logger = logging.getLogger("sentry.integrations.slack")
 
-from .auth import is_valid_role, set_signing_secret
+from .auth import is_valid_role, set_signing_secret, valid_team_membership_filter
 from .channel import get_channel_id, strip_channel_name, validate_channel_id
 from .notifications import send_incident_alert_notification
 from .rule_status import RedisRuleStatus
@@ -4,6 +4,8 @@ from datetime import datetime
 from hashlib import sha256
 from typing import TYPE_CHECKING, TypedDict
 
+from django.db.models import Q
+
 if TYPE_CHECKING:
     from sentry.models.organizationmember import OrganizationMember
 
@@ -15,6 +17,15 @@ def is_valid_role(org_member: "OrganizationMember") -> bool:
     return len({org_member.role} & set(ALLOWED_ROLES)) > 0
 
 
+def valid_team_membership_filter() -> Q:
+    """
+    Filter for `OrganizationMemberTeam` that keeps memberships which allow managing the
+    team: all teams of members with a valid role (see `is_valid_role`), and the teams
+    other members are team admin of.
+    """
+    return Q(organizationmember__role__in=ALLOWED_ROLES) | Q(role="admin")
+
+
 def _encode_data(secret: str, data: bytes, timestamp: str) -> str:
     req = b"v0:%s:%s" % (timestamp.encode("utf-8"), data)
     return "v0=" + hmac.new(secret.encode("utf-8"), req, sha256).hexdigest()
@@ -35,7 +35,7 @@ from sentry.utils.signing import unsign
 from sentry.web.frontend.base import BaseView, region_silo_view
 from sentry.web.helpers import render_to_response
 
-from ..utils import is_valid_role
+from ..utils import valid_team_membership_filter
 from . import SALT
 from . import build_linking_url as base_build_linking_url
 from . import never_cache, render_error_page
@@ -73,8 +73,8 @@ class SelectTeamForm(forms.Form):
     def __init__(self, teams: Sequence[Team], *args: Any, **kwargs: Any):
         super().__init__(*args, **kwargs)
 
+        # Setting the field's choices also updates its widget's choices.
         self.fields["team"].choices = [(team.id, team.slug) for team in teams]
-        self.fields["team"].widget.choices = self.fields["team"].choices
 
 
 @region_silo_view
@@ -121,17 +121,11 @@ class SlackLinkTeamView(BaseView):
         )
         # Filter to teams where we have write access to, either through having a sufficient
         # organization role (owner/manager/admin) or by being a team admin on at least one team.
-        teams_by_id = {}
-        for org_membership in organization_memberships:
-            for team in Team.objects.get_for_user(
-                org_membership.organization,
-                request.user,
-                # Setting is_team_admin to True only returns teams that member is team admin on.
-                # We only want to filter for this when the user does not have a sufficient
-                # role in the org, which is checked using is_valid_role.
-                is_team_admin=not is_valid_role(org_membership),
-            ):
-                teams_by_id[team.id] = team
+        teams = Team.objects.get_for_organization_members(
+            organization_memberships,
+            org_member_team_filter=valid_team_membership_filter(),
+        )
+        teams_by_id = {team.id: team for team in teams}
 
         if not teams_by_id:
             _logger.info("team.no_teams_found", extra=logger_params)
@@ -272,6 +272,18 @@ def normalize_value(
     return rv
 
 
+def killswitch_is_enabled(killswitch_name: str) -> bool:
+    """
+    Cheap check whether a killswitch has any conditions configured at all.
+
+    Hot paths can call this before building the context for
+    `killswitch_matches_context`, as killswitches without conditions never
+    match.
+    """
+    assert killswitch_name in ALL_KILLSWITCH_OPTIONS
+    return bool(options.get(killswitch_name))
+
+
 def killswitch_matches_context(killswitch_name: str, context: Context, emit_metrics=True) -> bool:
     assert killswitch_name in ALL_KILLSWITCH_OPTIONS
     assert set(ALL_KILLSWITCH_OPTIONS[killswitch_name].fields) == set(context)
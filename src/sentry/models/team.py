@@ -6,6 +6,7 @@ from typing import TYPE_CHECKING, ClassVar, Literal, overload
 
 from django.conf import settings
 from django.db import models, router, transaction
+from django.db.models import Q, QuerySet
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
@@ -29,6 +30,7 @@ from sentry.utils.snowflake import save_with_snowflake_id, snowflake_id_model
 
 if TYPE_CHECKING:
     from sentry.models.organization import Organization
+    from sentry.models.organizationmember import OrganizationMember
     from sentry.models.project import Project
     from sentry.models.user import User
     from sentry.users.services.user import RpcUser
@@ -123,6 +125,39 @@ class TeamManager(BaseManager["Team"]):
 
         return results
 
+    def get_for_organization_members(
+        self,
+        organization_members: QuerySet[OrganizationMember],
+        org_member_team_filter: Q | None = None,
+    ) -> list[Team]:
+        """
+        Returns a list of all teams a user has some level of access to across
+        the organizations of the given memberships, like `get_for_user` does for
+        a single organization.
+
+        `org_member_team_filter` can further restrict which team memberships
+        grant access to a team.
+        """
+        from sentry.auth.superuser import is_active_superuser
+        from sentry.models.organizationmemberteam import OrganizationMemberTeam
+
+        base_team_qs = self.filter(status=TeamStatus.ACTIVE).select_related("organization")
+
+        if env.request and is_active_superuser(env.request) or settings.SENTRY_PUBLIC:
+            team_qs = base_team_qs.filter(
+                organization_id__in=organization_members.values("organization_id")
+            )
+        else:
+            org_member_team_qs = OrganizationMemberTeam.objects.filter(
+                organizationmember__in=organization_members, is_active=True
+            )
+            if org_member_team_filter is not None:
+                org_member_team_qs = org_member_team_qs.filter(org_member_team_filter)
+
+            team_qs = base_team_qs.filter(id__in=org_member_team_qs.values("team"))
+
+        return sorted(team_qs, key=lambda x: x.name.lower())
+
     def post_save(self, *, instance: Team, created: bool, **kwargs: object) -> None:
         self.process_resource_change(instance, **kwargs)
 
@@ -3,7 +3,7 @@ from typing import Any, TypeVar
 
 from django.core.cache import cache
 
-__all__ = ["cache", "default_cache", "cache_key_for_event"]
+__all__ = ["cache", "default_cache", "cache_key_for_event", "cache_key_for_event_id"]
 
 default_cache = cache
 
@@ -11,4 +11,8 @@ T = TypeVar("T")
 
 
 def cache_key_for_event(data: Mapping[str, Any]) -> str:
-    return "e:{}:{}".format(data["event_id"], data["project"])
+    return cache_key_for_event_id(data["event_id"], data["project"])
+
+
+def cache_key_for_event_id(event_id: str, project_id: int) -> str:
+    return f"e:{event_id}:{project_id}"
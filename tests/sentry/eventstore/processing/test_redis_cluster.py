@@ -1,5 +1,8 @@
 from datetime import datetime
 
+import orjson
+
+from sentry.eventstore.processing.redis import RedisClusterEventProcessingStore
 from sentry.eventstore.reprocessing.redis import RedisReprocessingStore
 from sentry.testutils.helpers.redis import use_redis_cluster
 
@@ -20,3 +23,14 @@ def test_mark_event_reprocessed():
     assert progress is not None
     assert progress.get("syncCount") == 10
     assert progress.get("totalEvents") == 20
+
+
+@use_redis_cluster()
+def test_store_raw():
+    store = RedisClusterEventProcessingStore(cluster="cluster")
+    event = {"event_id": "a" * 32, "project": 1, "message": "hello world"}
+
+    key = store.store_raw(event, orjson.dumps(event))
+
+    assert key == f"e:{event['event_id']}:1"
+    assert store.get(key) == event
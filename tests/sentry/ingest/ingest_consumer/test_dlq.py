@@ -77,12 +77,16 @@ def test_dlq_invalid_messages(factories, topic_name, consumer_type) -> None:
         input_block_size=None,
         output_block_size=None,
     )
-    strategy = factory.create_with_partitions(Mock(), Mock())
 
     for payload in [bogus_payload, empty_event_payload, unsupported_message_type_payload]:
+        # Messages are processed in worker threads and errors only surface
+        # once the result is collected by `join`. A joined strategy cannot be
+        # reused, so every message gets its own.
+        strategy = factory.create_with_partitions(Mock(), Mock())
         with pytest.raises(InvalidMessage) as exc_info:
             message = make_message(payload, partition, offset)
             strategy.submit(message)
+            strategy.join()
 
         assert exc_info.value.partition == partition
         assert exc_info.value.offset == offset
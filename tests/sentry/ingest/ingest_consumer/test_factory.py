@@ -0,0 +1,73 @@
+import threading
+from datetime import datetime
+from unittest.mock import Mock, call
+
+import pytest
+from arroyo.backends.kafka import KafkaPayload
+from arroyo.processing.strategies import CommitOffsets, MessageRejected
+from arroyo.types import BrokerValue, Message, Partition, Topic
+
+from sentry.ingest.consumer.factory import IngestStrategyFactory, maybe_multiprocess_step
+from sentry.ingest.types import ConsumerType
+
+
+def make_message(payload: bytes, partition: Partition, offset: int) -> Message[KafkaPayload]:
+    return Message(
+        BrokerValue(
+            KafkaPayload(None, payload, []),
+            partition,
+            offset,
+            datetime.now(),
+        )
+    )
+
+
+def test_single_process_step_commits_in_order_after_processing() -> None:
+    partition = Partition(Topic("ingest-events"), 0)
+    release = threading.Event()
+    processed = []
+
+    def process(message: Message[KafkaPayload]) -> None:
+        # Hold back the first message until the test lets it through
+        if message.value.offset == 0:
+            assert release.wait(timeout=10)
+        processed.append(message.value.offset)
+
+    commit = Mock()
+    strategy = maybe_multiprocess_step(None, process, CommitOffsets(commit), None)
+
+    strategy.submit(make_message(b"0", partition, 0))
+    strategy.submit(make_message(b"1", partition, 1))
+    # The pipeline is full while the first message is still being processed
+    with pytest.raises(MessageRejected):
+        strategy.submit(make_message(b"2", partition, 2))
+
+    strategy.poll()
+    assert processed == []
+    commit.assert_not_called()
+
+    release.set()
+    strategy.join()
+
+    assert processed == [0, 1]
+    # Offsets are committed in order, each only once its message is processed
+    commits = [c for c in commit.call_args_list if c.args[0]]
+    assert commits == [call({partition: 1}), call({partition: 2})]
+
+
+def test_shutdown_flushes_best_effort_writes(monkeypatch) -> None:
+    flush = Mock()
+    monkeypatch.setattr("sentry.ingest.consumer.factory.flush_best_effort_writes", flush)
+    factory = IngestStrategyFactory(
+        ConsumerType.Events,
+        reprocess_only_stuck_events=False,
+        num_processes=1,
+        max_batch_size=1,
+        max_batch_time=1,
+        input_block_size=None,
+        output_block_size=None,
+    )
+
+    factory.shutdown()
+
+    flush.assert_called_once_with()
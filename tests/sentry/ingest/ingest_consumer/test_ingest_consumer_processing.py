@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import copy
 import datetime
+import threading
 import time
 import uuid
 import zipfile
@@ -10,15 +12,21 @@ from unittest.mock import Mock
 
 import orjson
 import pytest
+import sentry_sdk
 from arroyo.backends.kafka.consumer import KafkaPayload
 from arroyo.backends.local.backend import LocalBroker
 from arroyo.backends.local.storages.memory import MemoryMessageStorage
 from arroyo.types import Partition, Topic
 from django.conf import settings
+from django.test import override_settings
 
 from sentry import eventstore
 from sentry.event_manager import EventManager
+from sentry.eventstore.processing import event_processing_store
 from sentry.ingest.consumer.processors import (
+    _remember_processed_event,
+    _submit_best_effort,
+    flush_best_effort_writes,
     process_attachment_chunk,
     process_event,
     process_individual_attachment,
@@ -77,8 +85,18 @@ def preprocess_event(monkeypatch):
     return calls
 
 
+@pytest.fixture
+def inline_best_effort_writes(monkeypatch):
+    monkeypatch.setattr(
+        "sentry.ingest.consumer.processors._submit_best_effort",
+        lambda function, *args: function(*args),
+    )
+
+
 @django_db_all
-def test_deduplication_works(default_project, task_runner, preprocess_event):
+def test_deduplication_works(
+    default_project, task_runner, preprocess_event, inline_best_effort_writes
+):
     payload = get_normalized_event({"message": "hello world"}, default_project)
     event_id = payload["event_id"]
     project_id = default_project.id
@@ -107,6 +125,147 @@ def test_deduplication_works(default_project, task_runner, preprocess_event):
     }
 
 
+@django_db_all
+def test_reprocess_only_stuck_events_skips_unknown_events(
+    default_project, task_runner, preprocess_event
+):
+    payload = get_normalized_event({"message": "hello world"}, default_project)
+
+    process_event(
+        {
+            "payload": orjson.dumps(payload).decode(),
+            "start_time": time.time() - 3600,
+            "event_id": payload["event_id"],
+            "project_id": default_project.id,
+            "remote_addr": "127.0.0.1",
+        },
+        project=default_project,
+        reprocess_only_stuck_events=True,
+    )
+
+    assert not preprocess_event
+
+
+@django_db_all
+def test_reprocess_only_stuck_events_processes_stuck_events(
+    default_project, task_runner, preprocess_event
+):
+    payload = get_normalized_event({"message": "hello world"}, default_project)
+    event_id = payload["event_id"]
+    event_processing_store.store(payload)
+
+    process_event(
+        {
+            "payload": orjson.dumps(payload).decode(),
+            "start_time": time.time() - 3600,
+            "event_id": event_id,
+            "project_id": default_project.id,
+            "remote_addr": "127.0.0.1",
+        },
+        project=default_project,
+        reprocess_only_stuck_events=True,
+    )
+
+    (kwargs,) = preprocess_event
+    assert kwargs["event_id"] == event_id
+    assert kwargs["data"] == payload
+
+
+def test_best_effort_writes_run_inline_when_saturated(monkeypatch):
+    slots = threading.BoundedSemaphore(1)
+    slots.acquire()
+    monkeypatch.setattr("sentry.ingest.consumer.processors._best_effort_slots", slots)
+    pool = Mock()
+    monkeypatch.setattr("sentry.ingest.consumer.processors._best_effort_pool", pool)
+
+    threads = []
+    _submit_best_effort(lambda: threads.append(threading.current_thread()))
+
+    assert threads == [threading.current_thread()]
+    assert not pool.submit.called
+
+
+def test_flush_best_effort_writes_waits_for_pending_writes(monkeypatch):
+    monkeypatch.setattr(
+        "sentry.ingest.consumer.processors._best_effort_slots", threading.BoundedSemaphore(1)
+    )
+    monkeypatch.setattr("sentry.ingest.consumer.processors._best_effort_pool", None)
+
+    release = threading.Event()
+    written = []
+
+    def write():
+        assert release.wait(timeout=10)
+        written.append(threading.current_thread())
+
+    _submit_best_effort(write)
+    assert written == []
+
+    release.set()
+    flush_best_effort_writes()
+
+    (thread,) = written
+    assert thread is not threading.current_thread()
+
+
+def test_remember_processed_event_logs_cache_errors(monkeypatch):
+    cache = Mock()
+    cache.set.side_effect = Exception("cache unavailable")
+    logger = Mock()
+    monkeypatch.setattr("sentry.ingest.consumer.processors.cache", cache)
+    monkeypatch.setattr("sentry.ingest.consumer.processors.logger", logger)
+
+    _remember_processed_event("ev:1:abc")
+
+    cache.set.assert_called_once_with("ev:1:abc", "", 3600)
+    logger.warning.assert_called_once_with(
+        "ingest_consumer.deduplication.set_failed", exc_info=True
+    )
+
+
+@django_db_all
+@pytest.mark.parametrize("sample_rate", [0, 1.0])
+def test_spans_only_started_when_sampled(
+    default_project, task_runner, preprocess_event, monkeypatch, django_cache, sample_rate
+):
+    start_span = Mock(wraps=sentry_sdk.start_span)
+    monkeypatch.setattr("sentry_sdk.start_span", start_span)
+
+    payload = get_normalized_event({"message": "hello world"}, default_project)
+
+    with override_settings(SENTRY_INGEST_CONSUMER_APM_SAMPLING=sample_rate):
+        process_event(
+            {
+                "payload": orjson.dumps(payload).decode(),
+                "start_time": time.time() - 3600,
+                "event_id": payload["event_id"],
+                "project_id": default_project.id,
+                "remote_addr": "127.0.0.1",
+                "attachments": [
+                    {
+                        "id": "ca90fb45-6dd9-40a0-a18f-8693aa621abb",
+                        "name": "lol.txt",
+                        "content_type": "text/plain",
+                        "attachment_type": "custom.attachment",
+                        "data": b"Hello World!",
+                    }
+                ],
+            },
+            project=default_project,
+        )
+
+    assert len(preprocess_event) == 1
+    ops = {span_call.kwargs.get("op") for span_call in start_span.call_args_list}
+    expected_ops = {
+        "ingest_consumer.set_attachment_cache",
+        "ingest_consumer.process_event.preprocess_event",
+    }
+    if sample_rate:
+        assert expected_ops <= ops
+    else:
+        assert not expected_ops & ops
+
+
 @django_db_all
 def test_transactions_spawn_save_event_transaction(
     default_project,
@@ -288,26 +447,29 @@ def test_with_attachments(default_project, task_runner, missing_chunks, monkeypa
             }
         )
 
-    with task_runner():
-        process_event(
+    message = {
+        "payload": orjson.dumps(payload).decode(),
+        "start_time": start_time,
+        "event_id": event_id,
+        "project_id": project_id,
+        "remote_addr": "127.0.0.1",
+        "attachments": [
             {
-                "payload": orjson.dumps(payload).decode(),
-                "start_time": start_time,
-                "event_id": event_id,
-                "project_id": project_id,
-                "remote_addr": "127.0.0.1",
-                "attachments": [
-                    {
-                        "id": attachment_id,
-                        "name": "lol.txt",
-                        "content_type": "text/plain",
-                        "attachment_type": "custom.attachment",
-                        "chunks": 2,
-                    }
-                ],
-            },
-            project=default_project,
-        )
+                "id": attachment_id,
+                "name": "lol.txt",
+                "content_type": "text/plain",
+                "attachment_type": "custom.attachment",
+                "chunks": 2,
+            }
+        ],
+    }
+    original_message = copy.deepcopy(message)
+
+    with task_runner():
+        process_event(message, project=default_project)
+
+    # The attachment metadata is read, but never modified
+    assert message == original_message
 
     persisted_attachments = list(
         EventAttachment.objects.filter(project_id=project_id, event_id=event_id)
@@ -463,15 +625,18 @@ def test_individual_attachments(
             )
         expected_content = b"".join(chunks)
 
-    process_individual_attachment(
-        {
-            "type": "attachment",
-            "attachment": attachment_meta,
-            "event_id": event_id,
-            "project_id": project_id,
-        },
-        project=default_project,
-    )
+    message = {
+        "type": "attachment",
+        "attachment": attachment_meta,
+        "event_id": event_id,
+        "project_id": project_id,
+    }
+    original_message = copy.deepcopy(message)
+
+    process_individual_attachment(message, project=default_project)
+
+    # The attachment metadata is read, but never modified
+    assert message == original_message
 
     attachments = list(EventAttachment.objects.filter(project_id=project_id, event_id=event_id))
 
@@ -200,6 +200,47 @@ class SlackIntegrationLinkTeamTest(SlackIntegrationLinkTeamTestBase):
             )
             assert len(external_actors) == 1
 
+    def test_link_team_member_in_one_organization_admin_in_another(self):
+        """Test that team admin permissions in one organization do not grant access to the
+        teams of another organization where the user is a plain member"""
+        user = self.create_user(email="foo@example.com")
+        self.create_member(
+            teams=[self.team], user=user, role="member", organization=self.organization
+        )
+        organization2 = self.create_organization(owner=self.create_user())
+        team2 = self.create_team(organization=organization2)
+        self.create_member(
+            team_roles=[(team2, "admin")], user=user, role="member", organization=organization2
+        )
+        with assume_test_silo_mode(SiloMode.CONTROL):
+            self.create_organization_integration(
+                organization_id=organization2.id, integration=self.integration
+            )
+        self.login_as(user)
+
+        response = self.get_success_response()
+        assert list(response.context["teams"]) == [team2]
+
+        self.get_error_response(
+            data={"team": self.team.id}, status_code=status.HTTP_400_BAD_REQUEST
+        )
+        response = self.get_success_response(data={"team": team2.id})
+        self.assertTemplateUsed(response, "sentry/integrations/slack/post-linked-team.html")
+        assert len(self.get_linked_teams(organization=organization2, team_ids=[team2.id])) == 1
+
+    def test_link_team_as_superuser(self):
+        """Test that a superuser can link any team of the organization"""
+        user = self.create_user(email="foo@example.com", is_superuser=True)
+        self.create_member(user=user, role="member", organization=self.organization)
+        self.login_as(user, superuser=True)
+
+        response = self.get_success_response()
+        assert list(response.context["teams"]) == [self.team]
+
+        response = self.get_success_response(data={"team": self.team.id})
+        self.assertTemplateUsed(response, "sentry/integrations/slack/post-linked-team.html")
+        assert len(self.get_linked_teams()) == 1
+
     @with_feature("organizations:team-workflow-notifications")
     def test_message_includes_workflow(self):
         self.get_success_response(data={"team": self.team.id})
@@ -2,7 +2,13 @@ from __future__ import annotations
 
 import pytest
 
-from sentry.killswitches import _value_matches, normalize_value
+from sentry.killswitches import (
+    _value_matches,
+    killswitch_is_enabled,
+    killswitch_matches_context,
+    normalize_value,
+)
+from sentry.testutils.helpers.options import override_options
 
 
 def test_normalize_value():
@@ -97,3 +103,23 @@ def test_value_matches_positive(cfg, value):
 )
 def test_value_matches_negative(cfg, value):
     assert not _value_matches("store.load-shed-group-creation-projects", cfg, value)
+
+
+@pytest.mark.parametrize(
+    ("cfg", "enabled"),
+    (
+        ([], False),
+        ([{"project_id": "1"}], True),
+        ([{}], True),
+    ),
+)
+def test_killswitch_is_enabled(cfg, enabled):
+    with override_options({"store.load-shed-pipeline-projects": cfg}):
+        assert killswitch_is_enabled("store.load-shed-pipeline-projects") is enabled
+
+        # A killswitch that is not enabled must never match
+        if not enabled:
+            assert not killswitch_matches_context(
+                "store.load-shed-pipeline-projects",
+                {"project_id": 1, "event_id": "a" * 32, "has_attachments": False},
+            )